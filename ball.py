@@ -3,9 +3,11 @@ import random
 import math
 
 class Ball:
-    def __init__(self, position, radius,initial_velocity=(0, 0),gravity=0.1):
+    def __init__(self, position, radius,initial_velocity=(0, 0),gravity=0.1,rng=None):
+        # Générateur aléatoire (random.Random seedé pour un rendu déterministe, sinon le module global)
+        self.rng = rng if rng is not None else random
         self.radius = radius
-        self.color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+        self.color = (self.rng.randint(100, 255), self.rng.randint(100, 255), self.rng.randint(100, 255))
         self.ligne_color = (255, 0, 0)
         self.x = position[0]
         self.y = position[1]
@@ -25,16 +27,17 @@ class Ball:
         self.x += self.vx
         self.y += self.vy
         
-    def draw(self, ecran):
-        """ Dessine la balle sur l'écran Pygame """
-        pos_x = int(self.x)
-        pos_y = int(self.y)
-        pygame.draw.circle(ecran, self.color, (pos_x, pos_y), self.radius)
+    def draw(self, ecran, scale=1.0):
+        """ Dessine la balle sur l'écran Pygame (scale : facteur de résolution du rendu) """
+        pos_x = int(self.x * scale)
+        pos_y = int(self.y * scale)
+        radius = max(1, int(self.radius * scale))
+        pygame.draw.circle(ecran, self.color, (pos_x, pos_y), radius)
         
         # Dessiner une ligne pour voir la rotation
         if self.show_rotation:
-            end_x = pos_x + self.radius * math.cos(self.body.angle)
-            end_y = pos_y + self.radius * math.sin(self.body.angle)
+            end_x = pos_x + radius * math.cos(self.body.angle)
+            end_y = pos_y + radius * math.sin(self.body.angle)
             pygame.draw.line(ecran, self.ligne_color, (pos_x, pos_y), (int(end_x), int(end_y)), 2)
 
     def rotate(self, angle_degrees):
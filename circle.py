@@ -4,7 +4,9 @@ import math
 import random
 
 class Circle:
-    def __init__(self, x, y, radius, color=(255,255,255), line_width=1):
+    def __init__(self, x, y, radius, color=(255,255,255), line_width=1, rng=None):
+        # Générateur aléatoire (random.Random seedé pour un rendu déterministe, sinon le module global)
+        self.rng = rng if rng is not None else random
         self.x = float(x)
         self.y = float(y)
         self.radius = float(radius)
@@ -51,14 +53,15 @@ class Circle:
             ball.vx = reflect_vx 
             ball.vy = reflect_vy
 
-            ball.color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+            ball.color = (self.rng.randint(100, 255), self.rng.randint(100, 255), self.rng.randint(100, 255))
 
             return True 
         return False
 
-    def draw(self, screen):
-        """Dessine le cercle conteneur."""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.radius), self.line_width)
+    def draw(self, screen, scale=1.0):
+        """Dessine le cercle conteneur (scale : facteur de résolution du rendu)."""
+        pygame.draw.circle(screen, self.color, (int(self.x * scale), int(self.y * scale)),
+                           max(1, int(self.radius * scale)), self.line_width)
 
 
 
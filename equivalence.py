@@ -0,0 +1,145 @@
+import sys
+import hashlib
+
+import numpy as np
+import pygame
+
+from game import Game
+
+
+class Trace:
+    """ Empreintes d'une exécution : état physique par frame, pixels par frame dessinée, piste audio. """
+
+    def __init__(self):
+        self.state_hashes = []   # Une empreinte par frame simulée
+        self.frame_hashes = {}   # frame -> empreinte des pixels (frames dessinées seulement)
+        self.audio = None        # Piste audio master (ou None)
+
+
+def hash_etat(game):
+    """ Empreinte de l'état physique (positions, vitesses, couleurs, compteurs). """
+    valeurs = [len(game.objets_dynamiques), game.bounce_count]
+    for ball in game.objets_dynamiques:
+        valeurs.extend((ball.x, ball.y, ball.vx, ball.vy))
+        valeurs.extend(ball.color)
+    return hashlib.sha1(np.array(valeurs, dtype=np.float64).tobytes()).hexdigest()
+
+
+def hash_pixels(surface):
+    """ Empreinte des pixels RGB d'une surface Pygame. """
+    return hashlib.sha1(pygame.image.tobytes(surface, "RGB")).hexdigest()
+
+
+def capturer_trace(game, n_frames=None, with_pixels=True):
+    """
+    Fait tourner une scène SANS encodage et enregistre ses empreintes.
+
+    Reproduit la boucle de Game.run (physique à chaque frame,
+    dessin une frame sur game.frame_skip).
+    """
+    n_frames = game.max_frames if n_frames is None else n_frames
+    trace = Trace()
+
+    for game.frame_count in range(n_frames):
+        game.uptdate_physics()
+        trace.state_hashes.append(hash_etat(game))
+
+        if with_pixels and game.frame_count % game.frame_skip == 0:
+            game.draw()
+            trace.frame_hashes[game.frame_count] = hash_pixels(game.ecran)
+
+    if game.master_audio_track is not None:
+        trace.audio = game.master_audio_track.copy()
+
+    pygame.quit()
+    return trace
+
+
+def comparer_traces(reference, candidat, compare_pixels=True, compare_audio=True, audio_tolerance=0):
+    """
+    Compare deux traces et retourne la liste des différences (vide = équivalentes).
+
+    Args:
+        compare_pixels (bool): Compare les frames dessinées par les DEUX exécutions.
+        compare_audio (bool): Compare les pistes audio master.
+        audio_tolerance (int): Écart maximal autorisé par échantillon int16.
+    """
+    differences = []
+
+    if len(reference.state_hashes) != len(candidat.state_hashes):
+        differences.append(f"Nombre de frames différent : {len(reference.state_hashes)} != {len(candidat.state_hashes)}")
+    for frame, (ref, cand) in enumerate(zip(reference.state_hashes, candidat.state_hashes)):
+        if ref != cand:
+            differences.append(f"État physique divergent à partir de la frame {frame}")
+            break
+
+    if compare_pixels:
+        frames_communes = sorted(set(reference.frame_hashes) & set(candidat.frame_hashes))
+        if not frames_communes:
+            differences.append("Aucune frame dessinée en commun à comparer")
+        for frame in frames_communes:
+            if reference.frame_hashes[frame] != candidat.frame_hashes[frame]:
+                differences.append(f"Pixels divergents à partir de la frame {frame}")
+                break
+
+    if compare_audio:
+        if reference.audio is None or candidat.audio is None:
+            if reference.audio is not candidat.audio:
+                differences.append("Une seule des deux exécutions produit une piste audio")
+        elif reference.audio.shape != candidat.audio.shape:
+            differences.append(f"Pistes audio de formes différentes : {reference.audio.shape} != {candidat.audio.shape}")
+        else:
+            ecart = np.abs(reference.audio.astype(np.int32) - candidat.audio.astype(np.int32))
+            if ecart.max(initial=0) > audio_tolerance:
+                premier = int(np.argmax(ecart.max(axis=1) > audio_tolerance))
+                differences.append(f"Audio divergent (écart max {ecart.max()}) à partir de l'échantillon {premier}")
+
+    return differences
+
+
+def comparer_chemins(fabrique_reference, fabrique_candidat, n_frames=None,
+                     compare_pixels=True, compare_audio=True, audio_tolerance=0):
+    """
+    Exécute la même scène par le chemin de référence puis par le chemin optimisé
+    et compare leurs traces.
+
+    Les fabriques sont des fonctions sans argument retournant un Game
+    (seedé, et avec record_video=False pour ne rien écrire sur le disque).
+    """
+    reference = capturer_trace(fabrique_reference(), n_frames, with_pixels=compare_pixels)
+    candidat = capturer_trace(fabrique_candidat(), n_frames, with_pixels=compare_pixels)
+    return comparer_traces(reference, candidat, compare_pixels=compare_pixels,
+                           compare_audio=compare_audio, audio_tolerance=audio_tolerance)
+
+
+# --- Point d'entrée du script ---
+# `python equivalence.py [seed] [n_frames]`
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 1234
+    n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    verifications = [
+        # Deux rendus de référence seedés doivent être identiques (état, pixels, audio)
+        ("Déterminisme (référence vs référence)",
+         lambda: Game(seed=seed, record_video=False),
+         lambda: Game(seed=seed, record_video=False),
+         dict()),
+        # Le mode brouillon doit reproduire EXACTEMENT la physique du rendu complet
+        ("Physique (référence vs brouillon)",
+         lambda: Game(seed=seed, record_video=False),
+         lambda: Game(seed=seed, record_video=False, draft=True),
+         dict(compare_pixels=False, compare_audio=False)),
+    ]
+
+    echecs = 0
+    for nom, fabrique_reference, fabrique_candidat, options in verifications:
+        differences = comparer_chemins(fabrique_reference, fabrique_candidat, n_frames, **options)
+        if differences:
+            echecs += 1
+            print(f"[ÉCHEC] {nom}")
+            for difference in differences:
+                print(f"    - {difference}")
+        else:
+            print(f"[OK] {nom}")
+
+    sys.exit(1 if echecs else 0)
@@ -0,0 +1,266 @@
+import os
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# Encodage ffmpeg (réutilisé depuis MoviePy, déjà une dépendance du projet)
+from moviepy import ImageSequenceClip
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+from moviepy.video.io.ffmpeg_tools import ffmpeg_merge_video_audio
+
+
+class OutputProfile:
+    """
+    Décrit UNE variante de sortie (résolution/recadrage, codec, débit, audio).
+
+    Toutes les variantes sont alimentées par le même flux de frames capturées
+    et la même piste audio master (voir MultiExporter).
+    """
+
+    def __init__(self, name, filename, size=None, crop=None, codec='libx264',
+                 bitrate=None, preset='ultrafast', audio=True, fps=None,
+                 max_duration_sec=None, threads=2):
+        """
+        Args:
+            name (str): Nom court de la variante (utilisé pour les fichiers temporaires).
+            filename (str): Fichier final. Une extension '.gif' produit un GIF.
+            size (tuple): (largeur, hauteur) de sortie. None = taille source (après recadrage).
+                          Doit être paire pour libx264.
+            crop (tuple): (x, y, largeur, hauteur) en pixels source. None = image entière.
+            codec (str): Codec vidéo ffmpeg (ex: 'libx264').
+            bitrate (str): Débit vidéo ffmpeg (ex: '2000k'). None = défaut du codec.
+            preset (str): Preset ffmpeg (ex: 'ultrafast', 'medium').
+            audio (bool): Si True, la piste master est fusionnée dans la sortie.
+            fps (float): Images/s de sortie. Doit diviser le FPS source. None = FPS source.
+            max_duration_sec (float): Ne garde que le début de la simulation (GIF, miniature).
+            threads (int): Threads ffmpeg pour cette variante.
+        """
+        self.name = name
+        self.filename = filename
+        self.size = size
+        self.crop = crop
+        self.codec = codec
+        self.bitrate = bitrate
+        self.preset = preset
+        self.audio = audio
+        self.fps = fps
+        self.max_duration_sec = max_duration_sec
+        self.threads = threads
+
+    @property
+    def is_gif(self):
+        return self.filename.lower().endswith('.gif')
+
+
+# --- Variantes de publication standard (source 900x1600, 60 fps) ---
+PROFILS_PUBLICATION = [
+    OutputProfile('vertical', "simulation_physique_AVEC_SFX.mp4",
+                  codec='libx264', bitrate='8000k', preset='medium', audio=True),
+    OutputProfile('reduite', "simulation_physique_540x960.mp4", size=(540, 960),
+                  codec='libx264', bitrate='2500k', preset='fast', audio=True),
+    OutputProfile('carree', "simulation_physique_carree.mp4", crop=(0, 350, 900, 900),
+                  size=(720, 720), codec='libx264', bitrate='4000k', preset='fast', audio=True),
+    OutputProfile('gif', "simulation_physique_apercu.gif", size=(270, 480),
+                  audio=False, fps=15, max_duration_sec=4),
+]
+
+
+def _transformer_frame(frame, profile):
+    """ Applique le recadrage puis le redimensionnement d'un profil à une frame RGB. """
+    if profile.crop is not None:
+        x, y, w, h = profile.crop
+        frame = frame[y:y + h, x:x + w]
+    if profile.size is not None and (frame.shape[1], frame.shape[0]) != tuple(profile.size):
+        frame = cv2.resize(frame, tuple(profile.size), interpolation=cv2.INTER_AREA)
+    return np.ascontiguousarray(frame)
+
+
+def _encoder_worker(profile, shm_name, frame_shape, n_slots, source_fps, slot_queue, done_queue):
+    """
+    Processus d'encodage d'UNE variante.
+
+    Lit les frames dans le tampon partagé (indices reçus par slot_queue),
+    les encode, puis signale chaque slot libéré sur done_queue.
+    Le message ('fin', chemin_audio) termine l'encodage.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((n_slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+
+    out_fps = profile.fps or source_fps
+    frame_step = max(1, int(round(source_fps / out_fps)))
+    max_frames = None
+    if profile.max_duration_sec is not None:
+        max_frames = int(profile.max_duration_sec * source_fps)
+
+    temp_video_filename = f"temp_{profile.name}_sans_son.mp4"
+    writer = None
+    gif_frames = []
+    frame = None
+    erreur = None
+    index = 0
+
+    try:
+        while True:
+            message = slot_queue.get()
+            if isinstance(message, tuple):
+                _, audio_filename = message
+                break
+
+            # En cas d'erreur, on continue à libérer les slots pour ne pas bloquer le rendu
+            if erreur is None and index % frame_step == 0 and (max_frames is None or index < max_frames):
+                try:
+                    frame = _transformer_frame(ring[message], profile)
+                    if profile.is_gif:
+                        # Copie : la frame peut encore pointer dans le tampon partagé
+                        gif_frames.append(frame.copy())
+                    else:
+                        if writer is None:
+                            writer = FFMPEG_VideoWriter(
+                                temp_video_filename, (frame.shape[1], frame.shape[0]), out_fps,
+                                codec=profile.codec, preset=profile.preset,
+                                bitrate=profile.bitrate, threads=profile.threads)
+                        writer.write_frame(frame)
+                except Exception as e:
+                    erreur = e
+                    print(f"\n--- ERREUR D'ENCODAGE [{profile.name}] ---")
+                    print(f"Erreur : {e}")
+
+            index += 1
+            done_queue.put(message)
+
+        if erreur is not None:
+            return
+
+        # --- Finalisation de la variante ---
+        if profile.is_gif:
+            ImageSequenceClip(gif_frames, fps=out_fps).write_gif(profile.filename, logger=None)
+        elif writer is not None:
+            writer.close()
+            writer = None
+            if profile.audio and audio_filename is not None:
+                # La vidéo est déjà encodée : on copie le flux vidéo et on encode seulement l'audio
+                ffmpeg_merge_video_audio(temp_video_filename, audio_filename, profile.filename,
+                                         video_codec='copy', audio_codec='aac', logger=None)
+                os.remove(temp_video_filename)
+            else:
+                os.replace(temp_video_filename, profile.filename)
+
+        print(f"Variante '{profile.name}' sauvegardée sous : {profile.filename}")
+
+    except Exception as e:
+        print(f"\n--- ERREUR LORS DE LA FINALISATION [{profile.name}] ---")
+        print(f"Erreur : {e}")
+        print(f"Le fichier vidéo *sans son* est peut-être disponible ici : {temp_video_filename}")
+
+    finally:
+        if writer is not None:
+            writer.close()
+        # Plus aucune vue ne doit pointer dans le tampon avant de le fermer
+        frame = None
+        del ring
+        shm.close()
+
+
+class MultiExporter:
+    """
+    "Rendre une fois, encoder plusieurs fois".
+
+    Les frames capturées sont copiées UNE fois dans un tampon circulaire
+    en mémoire partagée ; chaque profil de sortie est encodé en parallèle
+    par son propre processus qui lit ce tampon. Un slot n'est réutilisé
+    que lorsque tous les encodeurs l'ont traité.
+    """
+
+    def __init__(self, profiles, frame_size, fps, n_slots=8):
+        """
+        Args:
+            profiles (list): Liste d'OutputProfile.
+            frame_size (tuple): (largeur, hauteur) des frames capturées.
+            fps (float): Images/s du flux capturé.
+            n_slots (int): Nombre de frames du tampon circulaire partagé.
+        """
+        if not profiles:
+            raise ValueError("Au moins un profil de sortie est nécessaire.")
+
+        self.profiles = list(profiles)
+        self.frame_shape = (frame_size[1], frame_size[0], 3)
+        self.n_slots = n_slots
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=frame_bytes * n_slots)
+        self._ring = np.ndarray((n_slots,) + self.frame_shape, dtype=np.uint8, buffer=self._shm.buf)
+
+        # Compteur de références par slot : nombre d'encodeurs qui ne l'ont pas encore lu
+        self._refcounts = [0] * n_slots
+        self._free_slots = list(range(n_slots))
+
+        self._done_queue = mp.Queue()
+        self._slot_queues = []
+        self._workers = []
+        for profile in self.profiles:
+            slot_queue = mp.Queue()
+            worker = mp.Process(
+                target=_encoder_worker,
+                args=(profile, self._shm.name, self.frame_shape, n_slots, fps, slot_queue, self._done_queue),
+                daemon=True,
+            )
+            worker.start()
+            self._slot_queues.append(slot_queue)
+            self._workers.append(worker)
+
+    def _liberer_un_slot(self):
+        """ Attend qu'un encodeur ait terminé une frame et met à jour les compteurs. """
+        while True:
+            try:
+                slot = self._done_queue.get(timeout=1.0)
+                break
+            except queue.Empty:
+                # Un encodeur a planté, ou tous sont terminés sans avoir libéré le slot
+                if any(worker.exitcode for worker in self._workers) or \
+                        all(worker.exitcode is not None for worker in self._workers):
+                    raise RuntimeError("Un processus d'encodage s'est arrêté de manière inattendue.")
+
+        self._refcounts[slot] -= 1
+        if self._refcounts[slot] == 0:
+            self._free_slots.append(slot)
+
+    def next_slot(self):
+        """ Retourne (indice, tableau (H, L, 3)) d'un slot libre où écrire la prochaine frame RGB. """
+        while not self._free_slots:
+            self._liberer_un_slot()
+        slot = self._free_slots.pop()
+        return slot, self._ring[slot]
+
+    def submit(self, slot):
+        """ Envoie le slot rempli à tous les encodeurs. """
+        self._refcounts[slot] = len(self._workers)
+        for slot_queue in self._slot_queues:
+            slot_queue.put(slot)
+
+    def write_frame(self, frame_rgb):
+        """ Copie une frame RGB (H, L, 3) dans le tampon partagé et la distribue. """
+        slot, buffer = self.next_slot()
+        np.copyto(buffer, frame_rgb)
+        self.submit(slot)
+
+    def close(self, audio_filename=None):
+        """
+        Termine tous les encodages (fusion avec audio_filename si fourni)
+        et libère la mémoire partagée.
+        """
+        for slot_queue in self._slot_queues:
+            slot_queue.put(('fin', audio_filename))
+
+        # Vider la file des slots traités AVANT join (évite un blocage de multiprocessing)
+        while any(self._refcounts):
+            self._liberer_un_slot()
+
+        for worker in self._workers:
+            worker.join()
+
+        del self._ring
+        self._shm.close()
+        self._shm.unlink()
@@ -16,6 +16,8 @@ from ball import Ball
 from arc import ArcShape
 from circle import Circle
 from sound_tools import SoundGenerator
+from export import MultiExporter, PROFILS_PUBLICATION
+from hud import GlyphAtlas, HudLayer
 
 # --- Constantes Globales ---
 LARGEUR_ECRAN = 9 * 100
@@ -26,18 +28,48 @@ ROUGE = (255, 0, 0)
 FPS = 60
 TEMPS_MAX_SEC = 15
 
+# --- Mode Brouillon (aperçu rapide) ---
+DRAFT_ECHELLE = 0.5        # Facteur de résolution du rendu interne
+DRAFT_SAUT_FRAMES = 3      # Ne dessine/capture qu'une frame sur N
+DRAFT_VIDEO_FILENAME = "simulation_physique_APERCU.mp4"
+
 
 # --- Classe principale du Jeu ---
 class Game:
-    def __init__(self, largeur_ecran=LARGEUR_ECRAN, hauteur_ecran=HAUTEUR_ECRAN):
+    def __init__(self, largeur_ecran=LARGEUR_ECRAN, hauteur_ecran=HAUTEUR_ECRAN,
+                 draft=False, draft_scale=DRAFT_ECHELLE, draft_frame_skip=DRAFT_SAUT_FRAMES,
+                 output_profiles=None, show_hud=True, seed=None, record_video=True):
         
         # --- Configuration de la fenêtre (virtuelle) ---
+        # La physique travaille TOUJOURS dans les coordonnées pleine résolution,
+        # seul le rendu est réduit en mode brouillon.
         self.largeur_ecran = largeur_ecran
         self.hauteur_ecran = hauteur_ecran
         self.center_x = self.largeur_ecran // 2
         self.center_y = self.hauteur_ecran // 2
         self.center = (self.center_x, self.center_y)
 
+        # --- Mode Brouillon ---
+        # Rendu à résolution réduite, une frame dessinée sur N, pas d'audio.
+        self.draft = draft
+        self.render_scale = draft_scale if draft else 1.0
+        self.frame_skip = max(1, int(draft_frame_skip)) if draft else 1
+        self.largeur_rendu = max(2, int(self.largeur_ecran * self.render_scale))
+        self.hauteur_rendu = max(2, int(self.hauteur_ecran * self.render_scale))
+
+        # --- Variantes de sortie (voir export.py) ---
+        # Si une liste d'OutputProfile est fournie, toutes les variantes sont encodées
+        # en parallèle à partir du même flux de frames (au lieu du seul fichier AVEC_SFX).
+        if draft and output_profiles:
+            raise ValueError("Le mode brouillon et les profils de sortie sont incompatibles.")
+        self.output_profiles = output_profiles
+
+        # --- Mode Déterministe ---
+        # Avec un seed, TOUT l'aléatoire (Game, Ball, Circle) passe par ce générateur :
+        # deux rendus de la même scène sont alors identiques (voir equivalence.py).
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
+
         # --- Configuration Audio ---
         self.sample_rate = 44100  # Qualité CD standard
         self.channels = 2         # Stéréo
@@ -55,13 +87,23 @@ class Game:
         pygame.mixer.init(frequency=self.sample_rate, size=-16, channels=self.channels, buffer=2048)
         
         # --- Chargement des Médias ---
-        self.font = pygame.font.Font(None, 52)
-        self.ecran = pygame.display.set_mode((self.largeur_ecran, self.hauteur_ecran))
+        self.font = pygame.font.Font(None, max(1, int(52 * self.render_scale)))
+        self.ecran = pygame.display.set_mode((self.largeur_rendu, self.hauteur_rendu))
         pygame.display.set_caption("Simulation Physique")
+
+        # Voile noir semi-transparent pour l'effet de traînée (créé une seule fois)
+        self.voile_surface = pygame.Surface((self.largeur_rendu, self.hauteur_rendu))
+        self.voile_surface.set_alpha(100) # (0=transparent, 255=opaque)
+        self.voile_surface.fill(NOIR)
         
         # Pré-calculer le rendu du texte statique
         self.static_text_surface = self.font.render("Comment the next thing to add to the animation", True, BLANC)
-        self.static_text_rect = self.static_text_surface.get_rect(topleft=(45, 200))
+        self.static_text_rect = self.static_text_surface.get_rect(
+            topleft=(int(45 * self.render_scale), int(200 * self.render_scale)))
+
+        # HUD dynamique (compteurs) composé depuis un atlas de glyphes pré-rendus
+        self.show_hud = show_hud
+        self.hud = HudLayer(GlyphAtlas(self.font, BLANC))
 
         # --- Chargement des Effets Sonores (SFX) ---
         # Charge le son de rebond et le convertit en tableau NumPy
@@ -82,10 +124,29 @@ class Game:
         # --- Configuration de la Simulation ---
         self.clock = pygame.time.Clock()
         self.frame_count = 0
+        self.bounce_count = 0
         self.max_duration_sec = TEMPS_MAX_SEC
         self.max_frames = FPS * self.max_duration_sec
 
 
+        # En mode brouillon, pas de musique ni de SFX : la piste audio n'existe pas
+        self.master_audio_track = None
+        if not self.draft:
+            self._init_master_audio_track()
+        
+        # Initialisation de l'enregistreur vidéo
+        # (record_video=False : aucune sortie, utilisé par le harnais d'équivalence)
+        self.exporter = None
+        self.video_writer = self._init_video_writer() if record_video else None
+
+        # Création des objets de la simulation
+        self.objets_dynamiques = [] 
+        self.objets_statiques = [] 
+        self.creer_objets_initiaux()
+
+    def _init_master_audio_track(self):
+        """ Charge la musique de fond et la boucle pour remplir la piste master. """
+
         try:
             music_file = "music/future-8bit.mp3" # Mettez le chemin de VOTRE fichier
             music_volume = 0.5 # Volume de la musique (0.0 à 1.0)
@@ -128,18 +189,10 @@ class Game:
             # Créer une piste de silence en cas d'échec
             total_samples = int(self.max_duration_sec * self.sample_rate)
             self.master_audio_track = np.zeros((total_samples, self.channels), dtype=np.int16)
-        
-        # Initialisation de l'enregistreur vidéo
-        self.video_writer = self._init_video_writer()
-
-        # Création des objets de la simulation
-        self.objets_dynamiques = [] 
-        self.objets_statiques = [] 
-        self.creer_objets_initiaux()
 
     def creer_objets_initiaux(self):
         """ Crée les objets initiaux de la simulation (le cercle). """
-        circle = Circle(self.center_x, self.center_y, radius=200)
+        circle = Circle(self.center_x, self.center_y, radius=200, rng=self.rng)
         self.objets_statiques.append(circle)
         self.creer_balle()
 
@@ -150,7 +203,7 @@ class Game:
             y = self.center_y
         if initial_velocity is None:
             initial_velocity = (-1, 0)
-        balle = Ball(position=(x, y), radius=20, initial_velocity=initial_velocity)
+        balle = Ball(position=(x, y), radius=20, initial_velocity=initial_velocity, rng=self.rng)
         self.objets_dynamiques.append(balle)
 
     def uptdate_physics(self): # (faute de frappe "uptdate" conservée)
@@ -163,11 +216,12 @@ class Game:
 
             for i,ball in enumerate(self.objets_dynamiques[0:100]):
                 if obj.handle_collision(ball):
+                    self.bounce_count += 1
                     if i <= 10:
                         self.record_sfx_at_current_frame()
 
-                    random_x = random.uniform(.7, 1.2)
-                    random_y = random.uniform(.7, 1.2)
+                    random_x = self.rng.uniform(.7, 1.2)
+                    random_y = self.rng.uniform(.7, 1.2)
                     initial_velocity = [-ball.vx+random_x,-ball.vy + random_y]
                     initial_velocity = initial_velocity / np.linalg.norm(initial_velocity)
 
@@ -181,9 +235,13 @@ class Game:
         # Utilise tqdm pour créer une barre de progression dans le terminal
         for self.frame_count in tqdm(range(self.max_frames), desc="[1/2] Simulation des frames", unit="frame"):
             
+            # La physique avance à CHAQUE frame (identique au rendu complet)
             self.uptdate_physics()
-            self.draw()
-            self.record_frame()
+
+            # En mode brouillon, on ne dessine/capture qu'une frame sur N
+            if self.frame_count % self.frame_skip == 0:
+                self.draw()
+                self.record_frame()
             
         print(f"Simulation terminée ({self.max_frames} frames).")
         
@@ -193,23 +251,40 @@ class Game:
     def draw(self):
         """ Dessine tous les éléments du jeu sur l'écran (virtuel). """
         
-        # Crée une surface noire semi-transparente pour l'effet de traînée
-        s = pygame.Surface((self.largeur_ecran, self.hauteur_ecran))
-        s.set_alpha(100) # (0=transparent, 255=opaque)
-        s.fill(NOIR)  
-        self.ecran.blit(s, (0, 0)) # Applique le "voile" noir
+        self.ecran.blit(self.voile_surface, (0, 0)) # Applique le "voile" noir
 
-        # Dessine les objets
+        # Dessine les objets (géométrie mise à l'échelle du rendu)
         for obj in self.objets_statiques:
-            obj.draw(self.ecran)
+            obj.draw(self.ecran, scale=self.render_scale)
         for obj in self.objets_dynamiques:
-            obj.draw(self.ecran)
+            obj.draw(self.ecran, scale=self.render_scale)
 
         # Dessine le texte statique (pré-calculé dans __init__)
         self.ecran.blit(self.static_text_surface, self.static_text_rect)
+
+        if self.show_hud:
+            self.draw_hud()
+
+    def draw_hud(self):
+        """ Met à jour et dessine les compteurs (seuls les textes modifiés sont recomposés). """
+        
+        x = int(45 * self.render_scale)
+        self.hud.set_text('balles', f"Balles : {len(self.objets_dynamiques)}", (x, int(60 * self.render_scale)))
+        self.hud.set_text('temps', f"Temps : {self.frame_count / FPS:.2f} s", (x, int(105 * self.render_scale)))
+        self.hud.set_text('rebonds', f"Rebonds : {self.bounce_count}", (x, int(150 * self.render_scale)))
+        self.hud.draw(self.ecran)
         
     def record_frame(self):
-        """ Capture l'écran Pygame et l'écrit dans le fichier vidéo OpenCV. """
+        """ Capture l'écran Pygame et l'écrit dans le fichier vidéo OpenCV (ou le tampon des encodeurs). """
+        
+        if self.exporter is not None:
+            # Copie UNIQUE de l'écran dans le tampon partagé lu par tous les encodeurs
+            slot, buffer = self.exporter.next_slot()
+            pixels = pygame.surfarray.pixels3d(self.ecran) # Vue (Largeur, Hauteur, 3), sans copie
+            np.copyto(buffer, pixels.transpose(1, 0, 2))
+            del pixels # Déverrouille la surface
+            self.exporter.submit(slot)
+            return
         
         # 1. Extraire les pixels de Pygame (format (Largeur, Hauteur, 3))
         frame_pixels = pygame.surfarray.array3d(self.ecran)
@@ -225,6 +300,10 @@ class Game:
 
     def record_sfx_at_current_frame(self):
         """ Mixe le son de rebond dans la piste audio master à la frame actuelle. """
+
+        # Pas d'audio en mode brouillon
+        if self.master_audio_track is None:
+            return
         
         # 1. Calculer l'échantillon de départ basé sur le temps actuel
         start_sample = int(self.frame_count * (self.sample_rate / FPS))
@@ -267,14 +346,39 @@ class Game:
  
     def _init_video_writer(self):
         """ Configure et retourne l'objet VideoWriter d'OpenCV. """
+
+        if self.output_profiles:
+            # Les processus d'encodage remplacent le VideoWriter OpenCV
+            self.exporter = MultiExporter(self.output_profiles, (self.largeur_rendu, self.hauteur_rendu), FPS)
+            return None
         
-        self.temp_video_filename = 'temp_video_sans_son.mp4' 
         fourcc = cv2.VideoWriter_fourcc(*'mp4v') # Codec MP4
+
+        if self.draft:
+            # Aperçu écrit directement (pas de fusion MoviePy) à FPS / N
+            # pour conserver la durée réelle de la simulation.
+            self.temp_video_filename = DRAFT_VIDEO_FILENAME
+            return cv2.VideoWriter(self.temp_video_filename, fourcc, FPS / self.frame_skip,
+                                   (self.largeur_rendu, self.hauteur_rendu))
+
+        self.temp_video_filename = 'temp_video_sans_son.mp4' 
         
         return cv2.VideoWriter(self.temp_video_filename, fourcc, FPS, (self.largeur_ecran, self.hauteur_ecran))
     
     def cleanup(self):
         """ Termine l'enregistrement, génère l'audio, fusionne, et ferme Pygame. """
+
+        if self.draft:
+            # Aperçu : la vidéo OpenCV est déjà le fichier final, sans audio
+            self.video_writer.release()
+            print(f"Aperçu (brouillon) sauvegardé sous : {self.temp_video_filename}")
+            pygame.quit()
+            sys.exit()
+
+        if self.exporter is not None:
+            self._finaliser_profils()
+            pygame.quit()
+            sys.exit()
         
         print("Finalisation (Étape 1/3 : Écriture de la vidéo)...")
         self.video_writer.release() 
@@ -343,7 +447,26 @@ class Game:
         pygame.quit()
         sys.exit()
 
+    def _finaliser_profils(self):
+        """ Écrit la piste audio master UNE fois et termine tous les encodages parallèles. """
+
+        print("Finalisation (Étape 1/2 : Écriture de l'audio SFX)...")
+        self.temp_audio_filename = "temp_sfx_track.wav"
+        wavfile.write(self.temp_audio_filename, self.sample_rate, self.master_audio_track)
+
+        print(f"Finalisation (Étape 2/2 : Encodage de {len(self.output_profiles)} variantes en parallèle)...")
+        try:
+            self.exporter.close(audio_filename=self.temp_audio_filename)
+        finally:
+            if os.path.exists(self.temp_audio_filename):
+                os.remove(self.temp_audio_filename)
+
 # --- Point d'entrée du script ---
 if __name__ == "__main__":
-    game = Game()
+    # `python game.py --draft` : aperçu rapide (basse résolution, sans audio)
+    # `python game.py --publication` : toutes les variantes de PROFILS_PUBLICATION en un seul rendu
+    # `python game.py --seed=42` : rendu déterministe (reproductible)
+    output_profiles = PROFILS_PUBLICATION if "--publication" in sys.argv else None
+    seed = next((int(arg.split("=", 1)[1]) for arg in sys.argv if arg.startswith("--seed=")), None)
+    game = Game(draft="--draft" in sys.argv, output_profiles=output_profiles, seed=seed)
     game.run()
\ No newline at end of file
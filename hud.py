@@ -0,0 +1,78 @@
+import string
+import pygame
+
+# Caractères pré-rendus dans l'atlas (les autres sont ajoutés à la demande)
+CARACTERES_HUD = string.ascii_letters + string.digits + string.punctuation + " éèêàçù"
+
+
+class GlyphAtlas:
+    """
+    Atlas de glyphes pré-rendus à partir d'une police Pygame.
+
+    Chaque caractère est rendu UNE seule fois ; les chaînes sont ensuite
+    composées en collant les glyphes en cache (un seul appel à blits),
+    ce qui évite un font.render() coûteux à chaque frame.
+    """
+
+    def __init__(self, font, color, charset=CARACTERES_HUD, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+
+        self.glyphs = {}
+        for char in charset:
+            self.glyph(char)
+
+    def glyph(self, char):
+        """ Retourne la surface d'un caractère (rendue et mise en cache si nécessaire). """
+        surface = self.glyphs.get(char)
+        if surface is None:
+            surface = self.font.render(char, self.antialias, self.color)
+            self.glyphs[char] = surface
+        return surface
+
+    def compose(self, text):
+        """ Compose une chaîne à partir des glyphes en cache et retourne la surface. """
+        glyphs = [self.glyph(char) for char in text]
+        largeur = max(1, sum(g.get_width() for g in glyphs))
+        surface = pygame.Surface((largeur, self.height), pygame.SRCALPHA)
+
+        # Les glyphes ne se chevauchent pas : BLEND_RGBA_MAX copie leurs pixels
+        # (couleur + alpha) sans assombrir les bords sur le fond transparent.
+        blit_sequence = []
+        x = 0
+        for g in glyphs:
+            blit_sequence.append((g, (x, 0), None, pygame.BLEND_RGBA_MAX))
+            x += g.get_width()
+        surface.blits(blit_sequence, doreturn=False)
+
+        return surface
+
+
+class HudLayer:
+    """
+    Calque de textes dynamiques (compteurs, chronomètre...).
+
+    Un texte n'est recomposé que lorsqu'il change ; les surfaces en cache
+    sont collées à chaque frame en un seul appel à blits.
+    """
+
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self._items = {} # clé -> [texte, surface, position]
+
+    def set_text(self, key, text, position):
+        """ Met à jour le texte d'un élément du HUD (recomposé seulement s'il a changé). """
+        item = self._items.get(key)
+        if item is None:
+            self._items[key] = [text, self.atlas.compose(text), position]
+            return
+        if item[0] != text:
+            item[0] = text
+            item[1] = self.atlas.compose(text)
+        item[2] = position
+
+    def draw(self, ecran):
+        """ Dessine tous les éléments du HUD sur l'écran. """
+        ecran.blits([(surface, position) for _, surface, position in self._items.values()], doreturn=False)